@@ -1,20 +1,135 @@
+import io
+import atexit
+import queue
+import threading
 import redis
-import json
+import msgspec
+import numpy as np
+import zstandard as zstd
+import pandas as pd
+import pyarrow as pa
 import logging
 import os
-from typing import Optional, Any
+import time
+from typing import Optional, Any, Callable, Iterable, Tuple, Union
 from dotenv import load_dotenv
 
 # Load environment variables
 load_dotenv()
 
+
+def _enc_hook(obj: Any) -> Any:
+    """Convert values MessagePack has no native type for (NumPy scalars, datetimes)"""
+    if isinstance(obj, np.floating):
+        return float(obj)
+    if isinstance(obj, np.integer):
+        return int(obj)
+    if hasattr(obj, 'isoformat'):
+        return obj.isoformat()
+    return str(obj)
+
+
+# Cached values are stored as MessagePack, which keeps numbers typed (no float-to-text round trip)
+_ENC = msgspec.msgpack.Encoder(enc_hook=_enc_hook)
+_DEC = msgspec.msgpack.Decoder()
+
+
+def _encode(value: Any) -> bytes:
+    """Serialize a value for Redis: DataFrames as Arrow IPC streams, everything else as MessagePack"""
+    if isinstance(value, pd.DataFrame):
+        return _encode_frame(value)
+    return _compress(_ENC.encode(value))
+
+
+def _encode_frame(df: pd.DataFrame) -> bytes:
+    """Serialize a DataFrame for Redis as an Arrow IPC stream"""
+    return _compress(_frame_to_arrow(df))
+
+
+def _decode(raw: bytes) -> Any:
+    """Deserialize a MessagePack value read from Redis"""
+    return _DEC.decode(_decompress(raw))
+
+
+def _decode_frame(raw: bytes) -> pd.DataFrame:
+    """Deserialize an Arrow IPC DataFrame read from Redis"""
+    return _frame_from_arrow(_decompress(raw))
+
+
+def _frame_to_arrow(df: pd.DataFrame) -> bytes:
+    """Write a DataFrame (index included) as a typed Arrow IPC stream"""
+    table = pa.Table.from_pandas(df)
+    sink = io.BytesIO()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue()
+
+
+def _frame_from_arrow(raw: bytes) -> pd.DataFrame:
+    """Read a DataFrame back from an Arrow IPC stream"""
+    return pa.ipc.open_stream(raw).read_pandas()
+
+
+# Serialized values larger than this are zstd-compressed; a one-byte prefix records which
+_COMPRESS_THRESHOLD = 1024
+_RAW_PREFIX = b'\x00'
+_ZSTD_PREFIX = b'\x01'
+
+# zstd contexts are not safe for concurrent use, so each thread gets its own
+_zstd_contexts = threading.local()
+
+
+def _compress(blob: bytes) -> bytes:
+    """Prefix a serialized value with its format byte, compressing it if large"""
+    if len(blob) <= _COMPRESS_THRESHOLD:
+        return _RAW_PREFIX + blob
+    if not hasattr(_zstd_contexts, 'compressor'):
+        _zstd_contexts.compressor = zstd.ZstdCompressor(level=3)
+    return _ZSTD_PREFIX + _zstd_contexts.compressor.compress(blob)
+
+
+def _decompress(raw: bytes) -> bytes:
+    """Strip the format byte from a stored value, decompressing it if needed"""
+    if raw[:1] == _ZSTD_PREFIX:
+        if not hasattr(_zstd_contexts, 'decompressor'):
+            _zstd_contexts.decompressor = zstd.ZstdDecompressor()
+        return _zstd_contexts.decompressor.decompress(raw[1:])
+    return raw[1:]
+
+
+# One connection pool per process, shared by every client so sockets are reused across calls
+_POOL = redis.BlockingConnectionPool(
+    host=os.getenv('REDIS_HOST', 'localhost'),
+    port=int(os.getenv('REDIS_PORT', 6379)),
+    db=int(os.getenv('REDIS_DB', 0)),
+    password=os.getenv('REDIS_PASSWORD') or None,
+    max_connections=int(os.getenv('REDIS_POOL_SIZE', 32)),
+    socket_connect_timeout=5,
+    socket_timeout=5
+)
+
+# A cache key is either a plain string key or a (hash family, field) pair
+CacheKey = Union[str, Tuple[str, str]]
+
+# Skip the liveness ping if a command succeeded within this many seconds
+_HEALTH_CHECK_INTERVAL = 30
+
+# While Redis is down, try to reconnect at most once per this many seconds
+_RECONNECT_INTERVAL = 2
+
+# Background writer: flush queued writes every 5 ms or every 64 entries, whichever comes first
+_WRITE_BATCH_WINDOW = 0.005
+_WRITE_BATCH_SIZE = 64
+
+# Queued by flush() to end the current batch early instead of waiting out the window
+_FLUSH_NOW = object()
+
 class RedisCache:
     """Redis cache helper class for managing cache operations"""
     
     def __init__(self):
         """Initialize Redis connection with configuration from environment variables"""
-        # Set up logging first
-        logging.basicConfig(level=logging.INFO)
+        # Logging is configured by the application; this module only emits records
         self.logger = logging.getLogger(__name__)
         
         self.host = os.getenv('REDIS_HOST', 'localhost')
@@ -25,87 +140,346 @@ class RedisCache:
         
         # Initialize Redis client
         self.redis_client = None
+        self._healthy = False
+        self._last_ok = 0.0
+        self._last_attempt = 0.0
+        
+        # Hit/miss counters for this process (cheaper than logging every lookup)
+        self._hits = 0
+        self._misses = 0
+        
+        # Writes are queued and sent by a background thread so callers never wait on Redis
+        self._write_queue = queue.Queue()
+        self._writer = None
+        self._writer_lock = threading.Lock()
         self.connect()
     
     def connect(self) -> bool:
-        """Establish connection to Redis server"""
+        """
+        Establish connection to Redis server
+        
+        The pool-backed client is kept even if Redis is unreachable, so a later
+        reconnect (see _available) can pick the server up again once it is back.
+        """
+        self.redis_client = redis.Redis(connection_pool=_POOL)
+        self._last_attempt = time.monotonic()
         try:
-            self.redis_client = redis.Redis(
-                host=self.host,
-                port=self.port,
-                db=self.db,
-                password=self.password if self.password else None,
-                decode_responses=True,  # Automatically decode responses to strings
-                socket_connect_timeout=5,
-                socket_timeout=5
-            )
-            
             # Test the connection
             self.redis_client.ping()
+            self._mark_ok()
             self.logger.info(f"Connected to Redis at {self.host}:{self.port}")
             return True
             
         except redis.ConnectionError as e:
             self.logger.error(f"Failed to connect to Redis: {e}")
-            self.redis_client = None
+            self._healthy = False
             return False
         except Exception as e:
             self.logger.error(f"Unexpected error connecting to Redis: {e}")
-            self.redis_client = None
+            self._healthy = False
+            return False
+    
+    def _available(self) -> bool:
+        """
+        Check whether a cache operation should go to Redis
+        
+        While healthy this costs no round-trip. After a failure, operations fail
+        fast, and a reconnect is attempted at most once per _RECONNECT_INTERVAL.
+        """
+        if self._healthy:
+            return True
+        if time.monotonic() - self._last_attempt < _RECONNECT_INTERVAL:
             return False
+        return self.connect()
     
     def is_connected(self) -> bool:
-        """Check if Redis is connected and accessible"""
-        if not self.redis_client:
+        """Check if Redis is connected, pinging only when the last success is stale"""
+        if self.redis_client is None:
             return False
+        if self._healthy and time.monotonic() - self._last_ok < _HEALTH_CHECK_INTERVAL:
+            return True
         try:
             self.redis_client.ping()
+            self._mark_ok()
             return True
         except:
+            self._healthy = False
             return False
     
-    def get(self, key: str) -> Optional[Any]:
-        """Get value from cache"""
-        if not self.is_connected():
+    def _mark_ok(self):
+        """Record a successful round-trip so is_connected() can skip its ping"""
+        self._healthy = True
+        self._last_ok = time.monotonic()
+    
+    def _execute(self, command: Callable[[redis.Redis], Any]) -> Any:
+        """Run a command against Redis, reconnecting and retrying once if the connection dropped"""
+        try:
+            result = command(self.redis_client)
+        except redis.ConnectionError:
+            self._healthy = False
+            if not self.connect():
+                raise
+            result = command(self.redis_client)
+        self._mark_ok()
+        return result
+    
+    def _enqueue_write(self, key: CacheKey, serialized_value: bytes, ttl: int):
+        """Queue a write for the background writer, starting it on first use"""
+        if self._writer is None or not self._writer.is_alive():
+            with self._writer_lock:
+                if self._writer is None or not self._writer.is_alive():
+                    self._writer = threading.Thread(target=self._drain_writes, name="redis-cache-writer", daemon=True)
+                    self._writer.start()
+        self._write_queue.put_nowait((key, serialized_value, ttl))
+    
+    def _drain_writes(self):
+        """Background loop sending queued writes to Redis in pipelined batches"""
+        while True:
+            batch = []
+            item = self._write_queue.get()
+            deadline = time.monotonic() + _WRITE_BATCH_WINDOW
+            while item is not _FLUSH_NOW:
+                batch.append(item)
+                remaining = deadline - time.monotonic()
+                if len(batch) >= _WRITE_BATCH_SIZE or remaining <= 0:
+                    break
+                try:
+                    item = self._write_queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            
+            if item is _FLUSH_NOW:
+                self._write_queue.task_done()
+            if not batch:
+                continue
+            
+            def write_batch(client: redis.Redis) -> list:
+                with client.pipeline(transaction=False) as pipe:
+                    for key, serialized_value, ttl in batch:
+                        self._stage_set(pipe, key, serialized_value, ttl)
+                    return pipe.execute()
+            
+            try:
+                self._execute(write_batch)
+                self.logger.debug("Wrote %d queued keys", len(batch))
+            except Exception as e:
+                self.logger.error(f"Error writing {len(batch)} queued keys: {e}")
+            finally:
+                for _ in batch:
+                    self._write_queue.task_done()
+    
+    def flush(self):
+        """Block until every queued write has been sent to Redis"""
+        if self._write_queue.unfinished_tasks:
+            self._write_queue.put_nowait(_FLUSH_NOW)
+            self._write_queue.join()
+    
+    def _flush_pending(self):
+        """Flush queued writes before a read so callers always see their own writes"""
+        if self._write_queue.unfinished_tasks:
+            self.flush()
+    
+    def _read(self, key: CacheKey, decode: Callable[[bytes], Any]) -> Optional[Any]:
+        """Read one cached value (plain key or hash field), counting the hit or miss"""
+        if not self._available():
             self.logger.warning("Redis not connected, cannot retrieve from cache")
             return None
         
+        self._flush_pending()
+        
         try:
-            value = self.redis_client.get(key)
-            if value:
-                self.logger.info(f"Cache HIT for key: {key}")
-                return json.loads(value)
+            value = self._execute(lambda client: self._stage_get(client, key))
+            if value is not None:
+                self._hits += 1
+                self.logger.debug("Cache HIT for key: %s", self._key_label(key))
+                return decode(value)
             else:
-                self.logger.info(f"Cache MISS for key: {key}")
+                self._misses += 1
+                self.logger.debug("Cache MISS for key: %s", self._key_label(key))
                 return None
         except Exception as e:
-            self.logger.error(f"Error getting key {key}: {e}")
+            self.logger.error(f"Error getting key {self._key_label(key)}: {e}")
             return None
     
+    def _write(self, key: CacheKey, value: Any, ttl: Optional[int],
+               encode: Callable[[Any], bytes]) -> bool:
+        """Encode a value and queue it for the background writer (returns without waiting for Redis)"""
+        if not self._available():
+            self.logger.warning("Redis not connected, cannot cache data")
+            return False
+        
+        try:
+            ttl = ttl or self.ttl
+            self._enqueue_write(key, encode(value), ttl)
+            self.logger.debug("Queued key: %s (TTL: %ss)", self._key_label(key), ttl)
+            return True
+        except Exception as e:
+            self.logger.error(f"Error setting key {self._key_label(key)}: {e}")
+            return False
+    
+    def get(self, key: str) -> Optional[Any]:
+        """Get value from cache"""
+        return self._read(key, _decode)
+    
     def set(self, key: str, value: Any, ttl: Optional[int] = None) -> bool:
-        """Set value in cache with TTL"""
-        if not self.is_connected():
+        """Set value in cache with TTL (queued; returns without waiting for Redis)"""
+        return self._write(key, value, ttl, _encode)
+    
+    def hget(self, family: str, field: str) -> Optional[Any]:
+        """Get a field value from a cached hash family"""
+        return self._read((family, field), _decode)
+    
+    def hset(self, family: str, field: str, value: Any, ttl: Optional[int] = None) -> bool:
+        """
+        Set a field value in a cached hash family with TTL
+        
+        Variants of one query (e.g. each delay type) are fields of a single hash,
+        so a family is one top-level key that expires, or is deleted, as a unit.
+        The TTL applies to the whole family and is refreshed on every write. Like
+        set(), the write is queued for the background writer.
+        """
+        return self._write((family, field), value, ttl, _encode)
+    
+    @staticmethod
+    def _stage_set(pipe, key: CacheKey, serialized_value: bytes, ttl: int):
+        """Queue a write on a pipeline; (family, field) keys are stored as hash fields"""
+        if isinstance(key, tuple):
+            family, field = key
+            pipe.hset(family, field, serialized_value)
+            pipe.expire(family, ttl)
+        else:
+            pipe.setex(key, ttl, serialized_value)
+    
+    @staticmethod
+    def _stage_get(pipe, key: CacheKey):
+        """Queue a read on a pipeline (or run it on a client); (family, field) keys are read as hash fields"""
+        if isinstance(key, tuple):
+            return pipe.hget(*key)
+        return pipe.get(key)
+    
+    @staticmethod
+    def _stage_exists(pipe, key: CacheKey):
+        """Queue an existence check on a pipeline; (family, field) keys are checked as hash fields"""
+        if isinstance(key, tuple):
+            return pipe.hexists(*key)
+        return pipe.exists(key)
+    
+    @staticmethod
+    def _key_label(key: CacheKey) -> str:
+        """Format a cache key for log messages"""
+        if isinstance(key, tuple):
+            return f"{key[0]}[{key[1]}]"
+        return key
+    
+    def get_arrow(self, key: CacheKey) -> Optional[pd.DataFrame]:
+        """Get a DataFrame stored as Arrow IPC bytes from cache"""
+        return self._read(key, _decode_frame)
+    
+    def set_arrow(self, key: CacheKey, df: pd.DataFrame, ttl: Optional[int] = None) -> bool:
+        """
+        Set a DataFrame in cache as Arrow IPC bytes with TTL
+        
+        Numeric-heavy frames are stored as typed column buffers, so no float is
+        formatted to text and parsed back. Like set(), the write is queued for the
+        background writer.
+        """
+        return self._write(key, df, ttl, _encode_frame)
+    
+    def mset_pipeline(self, items: dict, ttl: Optional[int] = None) -> bool:
+        """
+        Set multiple values in cache with TTL using a single pipelined round-trip
+        
+        Keys may be plain strings or (family, field) tuples for hash-stored results.
+        DataFrame values are stored as Arrow IPC; read them back with get_arrow.
+        """
+        if not self._available():
             self.logger.warning("Redis not connected, cannot cache data")
             return False
         
+        def setex_all(client: redis.Redis) -> list:
+            with client.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    self._stage_set(pipe, key, _encode(value), ttl)
+                return pipe.execute()
+        
         try:
             ttl = ttl or self.ttl
-            serialized_value = json.dumps(value, default=str)  # default=str handles datetime objects
-            result = self.redis_client.setex(key, ttl, serialized_value)
-            self.logger.info(f"Cached key: {key} (TTL: {ttl}s)")
-            return result
+            self._execute(setex_all)
+            self.logger.debug("Cached %d keys in one pipeline (TTL: %ss)", len(items), ttl)
+            return True
         except Exception as e:
-            self.logger.error(f"Error setting key {key}: {e}")
+            self.logger.error(f"Error setting keys {list(items)}: {e}")
             return False
     
+    def mget_pipeline(self, keys: list, frame_keys: Iterable[CacheKey] = ()) -> dict:
+        """
+        Get multiple values from cache using a single pipelined round-trip
+        
+        Keys may be plain strings or (family, field) tuples for hash-stored results.
+        Values of keys listed in frame_keys are read back as Arrow DataFrames.
+        """
+        if not self._available():
+            self.logger.warning("Redis not connected, cannot retrieve from cache")
+            return {key: None for key in keys}
+        
+        def get_all(client: redis.Redis) -> list:
+            with client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    self._stage_get(pipe, key)
+                return pipe.execute()
+        
+        self._flush_pending()
+        
+        try:
+            values = self._execute(get_all)
+            hits = sum(value is not None for value in values)
+            self._hits += hits
+            self._misses += len(values) - hits
+            frame_keys = set(frame_keys)
+            return {
+                key: None if value is None
+                else _decode_frame(value) if key in frame_keys
+                else _decode(value)
+                for key, value in zip(keys, values)
+            }
+        except Exception as e:
+            self.logger.error(f"Error getting keys {keys}: {e}")
+            return {key: None for key in keys}
+    
+    def exists_pipeline(self, keys: list) -> dict:
+        """
+        Check which keys are cached using a single pipelined round-trip
+        
+        Only existence is checked, so no values are transferred or decoded.
+        """
+        if not self._available():
+            self.logger.warning("Redis not connected, cannot check cache")
+            return {key: False for key in keys}
+        
+        def exists_all(client: redis.Redis) -> list:
+            with client.pipeline(transaction=False) as pipe:
+                for key in keys:
+                    self._stage_exists(pipe, key)
+                return pipe.execute()
+        
+        self._flush_pending()
+        
+        try:
+            return {key: bool(found) for key, found in zip(keys, self._execute(exists_all))}
+        except Exception as e:
+            self.logger.error(f"Error checking keys {keys}: {e}")
+            return {key: False for key in keys}
+    
     def delete(self, key: str) -> bool:
         """Delete key from cache"""
-        if not self.is_connected():
+        if not self._available():
             return False
         
+        self._flush_pending()
+        
         try:
-            result = self.redis_client.delete(key)
-            self.logger.info(f"Deleted key: {key}")
+            result = self._execute(lambda client: client.delete(key))
+            self.logger.debug("Deleted key: %s", key)
             return result > 0
         except Exception as e:
             self.logger.error(f"Error deleting key {key}: {e}")
@@ -113,11 +487,13 @@ class RedisCache:
     
     def clear_all(self) -> bool:
         """Clear all keys from current database"""
-        if not self.is_connected():
+        if not self._available():
             return False
         
+        self._flush_pending()
+        
         try:
-            self.redis_client.flushdb()
+            self._execute(lambda client: client.flushdb())
             self.logger.info("Cleared all cache keys")
             return True
         except Exception as e:
@@ -129,14 +505,23 @@ class RedisCache:
         if not self.is_connected():
             return {}
         
+        def info_and_dbsize(client: redis.Redis) -> list:
+            with client.pipeline(transaction=False) as pipe:
+                pipe.info()
+                pipe.dbsize()
+                return pipe.execute()
+        
         try:
-            info = self.redis_client.info()
+            # DBSIZE is O(1) server-side, unlike KEYS * which scans and transfers every keyname
+            info, total_keys = self._execute(info_and_dbsize)
             stats = {
                 'keyspace_hits': info.get('keyspace_hits', 0),
                 'keyspace_misses': info.get('keyspace_misses', 0),
                 'used_memory_human': info.get('used_memory_human', '0B'),
                 'connected_clients': info.get('connected_clients', 0),
-                'total_keys': len(self.redis_client.keys('*'))
+                'total_keys': total_keys,
+                'client_hits': self._hits,
+                'client_misses': self._misses
             }
             
             # Calculate hit rate
@@ -161,7 +546,6 @@ class RedisCache:
         }
         
         try:
-            import time
             start_time = time.time()
             self.redis_client.ping()
             latency = (time.time() - start_time) * 1000
@@ -180,8 +564,9 @@ class RedisCache:
         return status
 
 
-# Global cache instance
+# Global cache instance; queued writes are flushed at interpreter shutdown
 cache = RedisCache()
+atexit.register(cache.flush)
 
 
 def test_redis_connection():
@@ -5,8 +5,18 @@ Test script to validate the complete airline data analyzer setup
 
 import sys
 import os
+import io
+import json
+import asyncio
 import time
+import socket
+import http.client
+import urllib.parse
+import shutil
+import threading
 import subprocess
+import numpy as np
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
 
 # Add app directory to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
@@ -14,6 +24,40 @@ sys.path.append(os.path.join(os.path.dirname(__file__), 'app'))
 from cache import cache
 from main import AirlineDataAnalyzer
 
+TEST_DATA = 'data/test_flights.csv'
+
+# Timed queries are repeated this many times and the median run is compared
+TIMING_TRIALS = 10
+
+# PINGs sent in one pipeline when measuring Redis latency
+PING_BURST = 100
+
+# One analyzer, loaded once, is shared by every test that needs data
+_ANALYZER = None
+
+def _get_analyzer():
+    """Return the shared analyzer, loading the test data on first use"""
+    global _ANALYZER
+    if _ANALYZER is None:
+        _ANALYZER = AirlineDataAnalyzer(TEST_DATA)
+        _ANALYZER.load_data()
+    return _ANALYZER
+
+def _ping_latency_ns():
+    """Return the single-PING round-trip and the per-PING cost of a pipelined burst, in ns"""
+    client = cache.redis_client
+    start_ns = time.perf_counter_ns()
+    client.ping()
+    single_ns = time.perf_counter_ns() - start_ns
+    
+    with client.pipeline(transaction=False) as pipe:
+        for _ in range(PING_BURST):
+            pipe.ping()
+        start_ns = time.perf_counter_ns()
+        pipe.execute()
+        burst_ns = (time.perf_counter_ns() - start_ns) / PING_BURST
+    return single_ns, burst_ns
+
 def test_redis_connection():
     """Test Redis connection"""
     print("🔧 Testing Redis connection...")
@@ -21,6 +65,11 @@ def test_redis_connection():
     health = cache.health_check()
     if health['connected']:
         print(f"✅ Redis connected (latency: {health['latency_ms']}ms)")
+        single_ns, burst_ns = _ping_latency_ns()
+        print(f"   Single PING: {single_ns / 1e3:.1f}µs, pipelined: {burst_ns / 1e3:.1f}µs per PING "
+              f"({PING_BURST} in one round-trip)")
+        if burst_ns > single_ns:
+            print("   ⚠️ Pipelined PINGs are slower than a single one; pipeline may be misused or oversized")
         return True
     else:
         print(f"❌ Redis connection failed: {health['error']}")
@@ -30,10 +79,11 @@ def test_sample_data_generation():
     """Test sample data generation"""
     print("📊 Testing sample data generation...")
     
-    analyzer = AirlineDataAnalyzer('data/test_flights.csv')
-    success = analyzer.load_data()
+    # Load here rather than skipping: later tests need the data anyway, and in
+    # this first wave the one shared load overlaps the Docker probe
+    analyzer = _get_analyzer()
     
-    if success and analyzer.data is not None:
+    if analyzer.data is not None and len(analyzer.data) > 0:
         print(f"✅ Sample data generated: {len(analyzer.data):,} rows")
         return True
     else:
@@ -44,28 +94,49 @@ def test_caching_functionality():
     """Test caching functionality"""
     print("🎯 Testing caching functionality...")
     
-    analyzer = AirlineDataAnalyzer('data/test_flights.csv')
-    analyzer.load_data()
+    analyzer = _get_analyzer()
+    
+    # First query (should be slow): clear the cache before every trial
+    cold_ns = []
+    for _ in range(TIMING_TRIALS):
+        analyzer.clear_cache()
+        start_ns = time.perf_counter_ns()
+        result1 = analyzer.get_average_delay_per_airline('ARR_DELAY')
+        cold_ns.append(time.perf_counter_ns() - start_ns)
     
-    # Clear cache to start fresh
-    analyzer.clear_cache()
+    # Second query (should be fast from Redis): drop the analyzer's in-process
+    # copy first, otherwise the trial would time a dict lookup instead of Redis
+    warm_ns = []
+    for _ in range(TIMING_TRIALS):
+        analyzer._local.clear()
+        start_ns = time.perf_counter_ns()
+        result2 = analyzer.get_average_delay_per_airline('ARR_DELAY')
+        warm_ns.append(time.perf_counter_ns() - start_ns)
     
-    # First query (should be slow)
-    start_time = time.time()
-    result1 = analyzer.get_average_delay_per_airline('ARR_DELAY')
-    first_time = time.time() - start_time
+    # Read every cached result back in one pipelined round-trip, through a
+    # fresh analyzer, and check parity with the computed and warm results
+    reader = AirlineDataAnalyzer(TEST_DATA)
+    reader.prefetch()
+    from_redis = reader.get_average_delay_per_airline('ARR_DELAY')
     
-    # Second query (should be fast from cache)
-    start_time = time.time()
-    result2 = analyzer.get_average_delay_per_airline('ARR_DELAY')
-    second_time = time.time() - start_time
+    # Medians are robust to a single slow or lucky trial
+    first_ns, second_ns = np.median(cold_ns), np.median(warm_ns)
+    speedup = first_ns / second_ns
     
-    if result1 == result2 and second_time < first_time:
-        speedup = first_time / second_time if second_time > 0 else 0
+    # Both analyzers must key results by the same version of the data file
+    if reader.data_version != analyzer.data_version:
+        print(f"❌ Data version mismatch: {reader.data_version} != {analyzer.data_version}")
+        return False
+    
+    if result1 == result2 == from_redis and second_ns < first_ns:
         print(f"✅ Caching works! Speedup: {speedup:.1f}x")
-        print(f"   First run: {first_time:.3f}s")
-        print(f"   Second run: {second_time:.3f}s")
+        print(f"   Data version: {analyzer.data_version}")
+        print(f"   First run: {first_ns / 1e6:.3f}ms (median of {TIMING_TRIALS})")
+        print(f"   Second run: {second_ns / 1e6:.3f}ms (median of {TIMING_TRIALS})")
         return True
+    elif result1 == result2 == from_redis:
+        print(f"❌ Caching test failed: cached run was not faster ({speedup:.1f}x)")
+        return False
     else:
         print("❌ Caching test failed")
         return False
@@ -74,58 +145,137 @@ def test_all_query_types():
     """Test all query types"""
     print("📈 Testing all query types...")
     
-    analyzer = AirlineDataAnalyzer('data/test_flights.csv')
-    analyzer.load_data()
+    analyzer = _get_analyzer()
     
     tests = [
-        ('Average Arrival Delay', lambda: analyzer.get_average_delay_per_airline('ARR_DELAY')),
-        ('Average Departure Delay', lambda: analyzer.get_average_delay_per_airline('DEP_DELAY')),
-        ('Flights per Origin', lambda: analyzer.get_flights_per_airport('ORIGIN')),
-        ('Flights per Destination', lambda: analyzer.get_flights_per_airport('DEST')),
-        ('Monthly Stats', lambda: analyzer.get_delay_stats_by_month()),
-        ('Airline Performance', lambda: analyzer.get_airline_performance_summary()),
+        ('Average Arrival Delay', analyzer.get_average_delay_per_airline, ('ARR_DELAY',)),
+        ('Average Departure Delay', analyzer.get_average_delay_per_airline, ('DEP_DELAY',)),
+        ('Flights per Origin', analyzer.get_flights_per_airport, ('ORIGIN',)),
+        ('Flights per Destination', analyzer.get_flights_per_airport, ('DEST',)),
+        ('Monthly Stats', analyzer.get_delay_stats_by_month, ()),
+        ('Airline Performance', analyzer.get_airline_performance_summary, ()),
     ]
     
+    # Probe Redis for all six results in one round-trip; on any miss, compute
+    # all six in a single pass over the data instead of one scan per query
+    missing = analyzer.prefetch()
+    print(f"  🔎 {len(tests) - len(missing)}/{len(tests)} results prefetched from cache")
+    if missing:
+        analyzer.precompute_all()
+    
+    # Collect per-query lines and write them in one go after the loop
     passed = 0
-    for test_name, test_func in tests:
+    out = []
+    for test_name, query, args in tests:
         try:
-            result = test_func()
+            result = query(*args)
             if result:
-                print(f"  ✅ {test_name}")
+                out.append(f"  ✅ {test_name}")
                 passed += 1
             else:
-                print(f"  ❌ {test_name} (no data)")
+                out.append(f"  ❌ {test_name} (no data)")
         except Exception as e:
-            print(f"  ❌ {test_name} (error: {e})")
+            out.append(f"  ❌ {test_name} (error: {e})")
+    sys.stdout.write('\n'.join(out) + '\n')
+    sys.stdout.flush()
+    
+    # Every result should now be in Redis; check existence only, in one round-trip
+    stored = cache.exists_pipeline(list(analyzer.analysis_keys()))
+    unstored = sum(not found for found in stored.values())
+    if unstored:
+        print(f"  ❌ {unstored} results missing from Redis")
     
-    if passed == len(tests):
+    if passed == len(tests) and not unstored:
         print(f"✅ All {passed} query types working!")
         return True
     else:
-        print(f"❌ {len(tests) - passed} query types failed")
+        print(f"❌ {len(tests) - passed} query types failed, {unstored} not cached")
         return False
 
+DOCKER_SOCKET = '/var/run/docker.sock'
+
+class _DockerSocketConnection(http.client.HTTPConnection):
+    """HTTP connection to the Docker Engine API over its UNIX socket"""
+    
+    def __init__(self, timeout=10):
+        super().__init__('localhost', timeout=timeout)
+    
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(DOCKER_SOCKET)
+
+def _docker_redis_running():
+    """Ask the Docker Engine whether the compose 'redis' service has a running container"""
+    filters = json.dumps({'label': ['com.docker.compose.service=redis'], 'status': ['running']})
+    conn = _DockerSocketConnection()
+    try:
+        conn.request('GET', '/containers/json?filters=' + urllib.parse.quote(filters))
+        response = conn.getresponse()
+        if response.status != 200:
+            raise RuntimeError(f"Docker API returned {response.status}")
+        return len(json.loads(response.read())) > 0
+    finally:
+        conn.close()
+
+def _docker_compose(*args, timeout):
+    """
+    Run a docker-compose command and capture its output
+    
+    With an absolute executable path and close_fds=False, CPython starts the
+    child with posix_spawn instead of forking this (numpy-sized) process.
+    Descriptors opened by Python are non-inheritable, so none leak to the child.
+    """
+    executable = shutil.which('docker-compose')
+    if executable is None:
+        raise FileNotFoundError('docker-compose')
+    return subprocess.run([executable, *args], capture_output=True, text=True,
+                          timeout=timeout, close_fds=False)
+
+def _wait_for_redis(attempts=10):
+    """Poll Redis with PING, backing off exponentially; returns True once it answers"""
+    client = cache.redis_client
+    for attempt in range(attempts):
+        try:
+            client.ping()
+            return True
+        except (RedisConnectionError, RedisTimeoutError):
+            time.sleep(0.05 * 2 ** min(attempt, 5))
+    return False
+
 def test_docker_redis():
     """Test if Docker Redis is running"""
     print("🐳 Testing Docker Redis setup...")
     
     try:
-        result = subprocess.run(['docker-compose', 'ps'], 
-                              capture_output=True, text=True, timeout=10)
+        running = None
+        if hasattr(socket, 'AF_UNIX') and os.path.exists(DOCKER_SOCKET):
+            try:
+                running = _docker_redis_running()
+            except (OSError, AttributeError):
+                # Stale socket or daemon not answering
+                pass
+        if running is None:
+            # No usable Docker socket (e.g. Windows); ask docker-compose instead
+            result = _docker_compose('ps', timeout=10)
+            running = 'redis' in result.stdout and 'Up' in result.stdout
         
-        if 'redis' in result.stdout and 'Up' in result.stdout:
+        if running:
             print("✅ Docker Redis is running")
             return True
         else:
             print("⚠️ Docker Redis not detected, trying to start...")
             
             # Try to start Redis
-            start_result = subprocess.run(['docker-compose', 'up', '-d', 'redis'], 
-                                        capture_output=True, text=True, timeout=30)
+            start_result = _docker_compose('up', '-d', 'redis', timeout=30)
             
             if start_result.returncode == 0:
-                print("✅ Redis started successfully")
-                time.sleep(2)  # Wait for Redis to be ready
+                if _wait_for_redis():
+                    print("✅ Redis started successfully")
+                else:
+                    print("⚠️ Redis started but is not answering PING yet")
+                    time.sleep(2)
+                cache.connect()
                 return True
             else:
                 print(f"❌ Failed to start Redis: {start_result.stderr}")
@@ -141,32 +291,71 @@ def test_docker_redis():
         print(f"❌ Docker test failed: {e}")
         return False
 
-def run_all_tests():
+class _PerThreadStdout:
+    """sys.stdout stand-in that lets each worker thread capture its own output"""
+    
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+    
+    def capture(self):
+        self._local.buffer = io.StringIO()
+    
+    def release(self) -> str:
+        output = self._local.buffer.getvalue()
+        self._local.buffer = None
+        return output
+    
+    def write(self, text):
+        return (getattr(self._local, 'buffer', None) or self._stream).write(text)
+    
+    def __getattr__(self, name):
+        return getattr(self._stream, name)
+
+def _run_test(test_name, test_func):
+    """Run one test with its output captured; returns (passed, output)"""
+    sys.stdout.capture()
+    try:
+        passed = bool(test_func())
+    except Exception as e:
+        print(f"❌ Test '{test_name}' failed with error: {e}")
+        passed = False
+    return passed, sys.stdout.release()
+
+async def run_all_tests():
     """Run all tests"""
     print("🧪 Running comprehensive test suite...\n")
     
-    tests = [
-        ("Docker Redis Setup", test_docker_redis),
-        ("Redis Connection", test_redis_connection),
-        ("Sample Data Generation", test_sample_data_generation),
-        ("Caching Functionality", test_caching_functionality),
-        ("All Query Types", test_all_query_types),
+    # Tests in a wave run concurrently; each wave waits for the one before it.
+    # The Redis check needs Docker up, and the caching tests share the cache.
+    waves = [
+        [("Docker Redis Setup", test_docker_redis),
+         ("Sample Data Generation", test_sample_data_generation)],
+        [("Redis Connection", test_redis_connection)],
+        [("Caching Functionality", test_caching_functionality)],
+        [("All Query Types", test_all_query_types)],
     ]
     
-    passed = 0
-    total = len(tests)
+    results = {}
+    total = sum(len(wave) for wave in waves)
     
-    for test_name, test_func in tests:
-        print(f"\n{'='*50}")
-        print(f"🔍 Running: {test_name}")
-        print(f"{'='*50}")
-        
-        try:
-            if test_func():
-                passed += 1
-            time.sleep(1)  # Brief pause between tests
-        except Exception as e:
-            print(f"❌ Test '{test_name}' failed with error: {e}")
+    stdout = sys.stdout
+    sys.stdout = _PerThreadStdout(stdout)
+    try:
+        for wave in waves:
+            outcomes = await asyncio.gather(*(
+                asyncio.to_thread(_run_test, test_name, test_func) for test_name, test_func in wave
+            ))
+            for (test_name, _), (test_passed, output) in zip(wave, outcomes):
+                print(f"\n{'='*50}")
+                print(f"🔍 Running: {test_name}")
+                print(f"{'='*50}")
+                print(output, end='')
+                results[test_name] = test_passed
+    finally:
+        sys.stdout = stdout
+    
+    passed = sum(results.values())
     
     # Summary
     print(f"\n{'='*50}")
@@ -193,5 +382,5 @@ def run_all_tests():
     return passed == total
 
 if __name__ == "__main__":
-    success = run_all_tests()
+    success = asyncio.run(run_all_tests())
     sys.exit(0 if success else 1)